@@ -4,21 +4,118 @@ This module provides functionality to manage and monitor integrations, including
 """
 
 import asyncio
-from typing import Any, Literal
+import base64
+import json
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Literal, cast
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from loguru import logger
 from port_ocean.clients.port.authentication import PortAuthentication
-from port_ocean.utils import http_async_client
+from port_ocean.context.ocean import ocean
+from port_ocean.helpers.async_client import OceanAsyncClient
+from port_ocean.helpers.retry import RetryTransport
 
 # Define possible integration health states
 type IntegrationHealth = Literal["HEALTHY", "WARNING", "ERROR", "INACTIVE"]
 
+# Integration log entry as a (level, message, timestamp) tuple
+type IntegrationLog = tuple[str, str, str]
+
+# Connection pool limits for the shared HTTP client. Idle connections are kept alive
+# between resyncs so consecutive requests to Port's API reuse the same connection.
+HTTP_CLIENT_MAX_CONNECTIONS = 100
+HTTP_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=50,
+    max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+    keepalive_expiry=30,
+)
+
+# Each enrichment sends its audit log and integration log requests concurrently, so
+# enriching half as many integrations as the pool has connections keeps every in-flight
+# request within the pool
+DEFAULT_CONCURRENCY = HTTP_CLIENT_MAX_CONNECTIONS // 2
+
+# Cached request headers are refreshed this many seconds before the token expires,
+# or after the default TTL if the token's expiry can't be read
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+DEFAULT_TOKEN_TTL_SECONDS = 55 * 60
+
+# Integrations created within this period that haven't started a resync are reported as
+# inactive without fetching their logs
+INITIALIZATION_GRACE_PERIOD = timedelta(seconds=60)
+
+# Size and lifetime of the per-integration log caches
+LOGS_CACHE_MAX_SIZE = 512
+LOGS_CACHE_TTL_SECONDS = 60
+
+# Only idempotent GET requests are retried, on rate limiting and server errors, with
+# exponential backoff and jitter. A few attempts keep one failing request from stalling
+# the whole resync
+HTTP_CLIENT_RETRY_CONFIG: dict[str, Any] = {
+    "max_attempts": 3,
+    "base_delay": 0.1,
+    "jitter_ratio": 0.5,
+    "retryable_methods": ["GET"],
+    "retry_status_codes": [429, 500, 502, 503, 504],
+}
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _create_http_client(timeout: float) -> httpx.AsyncClient:
+    """
+    Create an HTTP client for requests to Port's API.
+
+    The client keeps ocean's retry transport, and enables HTTP/2 so that concurrent
+    requests are multiplexed over a single connection.
+
+    Args:
+        timeout: The request timeout in seconds
+
+    Returns:
+        The new HTTP client
+    """
+    return OceanAsyncClient(
+        RetryTransport,
+        transport_kwargs=HTTP_CLIENT_RETRY_CONFIG,
+        http2=True,
+        limits=HTTP_CLIENT_LIMITS,
+        timeout=timeout,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client used for requests to Port's API, creating it on first use.
+
+    Returns:
+        The shared HTTP client
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = _create_http_client(ocean.config.client_timeout)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client, if it was created.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class IntegrationClient:
     """
     Client for interacting with Port's integration API.
-    
+
     This client handles authentication, making requests to Port's API, and processing integration-related data.
     It provides methods to fetch integration details, logs, and perform health checks.
     """
@@ -29,103 +126,225 @@ class IntegrationClient:
         client_secret: str,
         port_client_auth: PortAuthentication,
         base_url: str = "https://api.port.io",
+        concurrency: int = DEFAULT_CONCURRENCY,
     ):
         """
         Initialize the integration client.
-        
+
         Args:
             client_id: The client ID for authentication
             client_secret: The client secret for authentication
             port_client_auth: Port authentication object
             base_url: The base URL for the Port API (defaults to https://api.port.io)
+            concurrency: Maximum number of integrations enriched concurrently (defaults to
+                half the HTTP client's connection pool size)
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.base_url = base_url
-        self.client = http_async_client
+        self.client = get_http_client()
         self.auth = port_client_auth
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # The audit log query parameters that don't depend on the integration are encoded once
+        self._audit_log_url = httpx.URL(
+            f"{base_url}/v1/audit-log",
+            params={"limit": 1000, "includes": ["status", "message"]},
+        )
+        self._headers: dict[str, Any] | None = None
+        self._headers_expiry = 0.0
+        self._headers_lock = asyncio.Lock()
+        self._integrations: list[dict[str, Any]] | None = None
+        # The health derived from fetched logs is reused for a short while, so resyncs that
+        # run close together don't request the same logs again. Only the derived results are
+        # cached, keeping each entry small regardless of how many logs were fetched
+        self._logs_health_cache: TTLCache[
+            tuple[str, str, int, int], tuple[IntegrationHealth, str]
+        ] = TTLCache(maxsize=LOGS_CACHE_MAX_SIZE, ttl=LOGS_CACHE_TTL_SECONDS)
+        self._audit_logs_health_cache: TTLCache[
+            tuple[str, str], tuple[IntegrationHealth, str, int, int]
+        ] = TTLCache(maxsize=LOGS_CACHE_MAX_SIZE, ttl=LOGS_CACHE_TTL_SECONDS)
+        self._integrations_etag: str | None = None
+
+    @staticmethod
+    def _get_token_ttl(token: str) -> float:
+        """
+        Get the number of seconds a token can be reused for, based on its JWT expiry claim.
+
+        Args:
+            token: The full authorization token, including its type prefix
+
+        Returns:
+            Seconds until the token expires minus a safety margin, or a default TTL if
+            the token's expiry can't be determined
+        """
+        try:
+            payload = token.rsplit(" ", 1)[-1].split(".")[1]
+            claims = json.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+            return float(claims["exp"]) - time.time() - TOKEN_EXPIRY_MARGIN_SECONDS
+        except (IndexError, KeyError, TypeError, ValueError):
+            return DEFAULT_TOKEN_TTL_SECONDS
 
     async def _get_headers(self) -> dict[str, Any]:
         """
         Get the headers required for API requests, including the authentication token.
-        
+
+        The headers are cached until shortly before the token expires, so concurrent requests
+        share a single token lookup. The returned dictionary must not be modified.
+
         Returns:
             Dictionary containing Authorization and Content-Type headers
         """
-        token = await self.auth.token
+        if self._headers is not None and time.monotonic() < self._headers_expiry:
+            return self._headers
+
+        async with self._headers_lock:
+            if self._headers is None or time.monotonic() >= self._headers_expiry:
+                token = await self.auth.token
+                self._headers = {
+                    "Authorization": token,
+                    "Content-Type": "application/json",
+                }
+                self._headers_expiry = time.monotonic() + self._get_token_ttl(token)
+        return self._headers
+
+    async def _send_raw_request(
+        self,
+        method: str,
+        url: str | httpx.URL,
+        headers: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send an HTTP request to the Port API and return the raw response.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: The endpoint URL
+            headers: Additional headers to send along with the default headers
+            **kwargs: Additional arguments to pass to the request
+
+        Returns:
+            The HTTP response from the API, whatever its status code
 
-        return {
-            "Authorization": token,
-            "Content-Type": "application/json",
-        }
+        Raises:
+            httpx.HTTPError: If there's a general HTTP error
+        """
+        logger.debug("Sending request to {} with method {}", url, method)
+        request_headers = await self._get_headers()
+        if headers:
+            request_headers = {**request_headers, **headers}
+        try:
+            return await self.client.request(
+                method, url, headers=request_headers, **kwargs
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP request failed: {e}")
+            raise e
 
-    async def _send_request[T](self, method: str, url: str, **kwargs: Any) -> T:
+    async def _send_request[
+        T
+    ](self, method: str, url: str | httpx.URL, **kwargs: Any) -> T:
         """
         Send an HTTP request to the Port API.
-        
+
         Args:
             method: HTTP method (GET, POST, etc.)
             url: The endpoint URL
             **kwargs: Additional arguments to pass to the request
-            
+
         Returns:
             The JSON response from the API
-            
+
         Raises:
             httpx.HTTPStatusError: If the request fails with a non-200 status code
             httpx.HTTPError: If there's a general HTTP error
         """
-        logger.info(f"Sending request to {url} with method {method}")
+        response = await self._send_raw_request(method, url, **kwargs)
+        self._raise_for_status(response)
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        """
+        Raise an error if the response doesn't have a successful status code.
+
+        Args:
+            response: The HTTP response to check
+
+        Raises:
+            httpx.HTTPStatusError: If the response status code isn't 2xx
+        """
         try:
-            response = await self.client.request(
-                method, url, headers=await self._get_headers(), **kwargs
-            )
-            return response.json()
+            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Request failed with status code {e.response.status_code}: {e.response.text}"
             )
             raise e
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP request failed: {e}")
-            raise e
 
     async def _fetch_integrations(self) -> list[dict[str, Any]]:
         """
         Fetch all integrations from the Port API.
-        
+
+        The request is made conditional on the ETag of the previous response, if any. When
+        the API reports the integrations as unchanged, the previously fetched list is reused.
+
         Returns:
-            List of integration dictionaries containing integration details
+            List of integration dictionaries containing integration details. Each dictionary
+            is a copy, so it can be enriched without affecting the cached list.
         """
         logger.info(f"Fetching integrations from {self.base_url}")
-        integrations: dict[str, Any | list[dict[str, Any]]] = await self._send_request(
-            "GET", f"{self.base_url}/v1/integration"
+        headers = (
+            {"If-None-Match": self._integrations_etag}
+            if self._integrations_etag and self._integrations is not None
+            else None
+        )
+        response = await self._send_raw_request(
+            "GET", f"{self.base_url}/v1/integration", headers=headers
         )
-        return integrations["integrations"]
+        if (
+            response.status_code == httpx.codes.NOT_MODIFIED
+            and self._integrations is not None
+        ):
+            logger.info("Integrations haven't changed since the last fetch")
+            integrations_list = self._integrations
+        else:
+            self._raise_for_status(response)
+            integrations: dict[str, Any | list[dict[str, Any]]] = orjson.loads(
+                response.content
+            )
+            integrations_list = integrations["integrations"]
+            self._integrations = integrations_list
+            self._integrations_etag = response.headers.get("ETag")
+        return [dict(integration) for integration in integrations_list]
 
     async def _get_integration_logs(
         self, integration_id: str, limit: int = 100
-    ) -> list[dict[str, Any]]:
+    ) -> list[IntegrationLog]:
         """
         Fetch logs for a specific integration.
-        
+
         Args:
             integration_id: The ID of the integration to fetch logs for
             limit: Maximum number of logs to return (default: 100)
-            
+
         Returns:
-            List of log entries for the integration
+            List of (level, message, timestamp) tuples for the integration's log entries
         """
-        logger.info(
-            f"Fetching logs for integration {integration_id} with limit {limit}"
+        logger.debug(
+            "Fetching logs for integration {} with limit {}", integration_id, limit
         )
         logs: dict[str, Any | list[dict[str, Any]]] = await self._send_request(
             "GET",
             f"{self.base_url}/v1/integration/{integration_id}/logs",
             params={"limit": limit},
         )
-        logs_list = logs["data"]
-        logger.info(f"Fetched {len(logs_list)} logs")
+        logs_list = [
+            (log["level"], log["message"], log["timestamp"]) for log in logs["data"]
+        ]
+        logger.debug("Fetched {} logs", len(logs_list))
         return logs_list
 
     async def _get_integration_audit_logs(
@@ -133,63 +352,118 @@ class IntegrationClient:
     ) -> list[dict[str, Any]]:
         """
         Fetch audit logs for a specific integration from a given date.
-        
+
         Args:
             integration_id: The ID of the integration to fetch audit logs for
             from_date: The date to fetch logs from
-            
+
         Returns:
             List of audit log entries for the integration
         """
-        logger.info(
-            f"Fetching audit logs for integration {integration_id} with from date {from_date}"
+        logger.debug(
+            "Fetching audit logs for integration {} with from date {}",
+            integration_id,
+            from_date,
         )
         logs: dict[str, Any | list[dict[str, Any]]] = await self._send_request(
             "GET",
-            f"{self.base_url}/v1/audit-log",
-            params={
-                "from": from_date,
-                "InstallationId": integration_id,
-                "limit": 1000,
-                "includes": ["status", "message"],
-            },
+            self._audit_log_url.copy_merge_params(
+                {"from": from_date, "InstallationId": integration_id}
+            ),
         )
         audits = logs["audits"]
-        logger.info(f"Fetched {len(audits)} audit logs")
+        logger.debug("Fetched {} audit logs", len(audits))
         return audits
 
+    async def _get_integration_logs_health(
+        self,
+        integration_id: str,
+        from_date: str,
+        limit: int,
+        context_logs_count: int,
+    ) -> tuple[IntegrationHealth, str]:
+        """
+        Get the health of an integration based on its logs, reusing a recently cached result.
+
+        Args:
+            integration_id: The ID of the integration to check
+            from_date: The date to consider logs from. It also keys the cache, so logs are
+                refetched once a new resync starts
+            limit: Maximum number of logs to fetch
+            context_logs_count: Number of recent logs to include in error/warning messages
+
+        Returns:
+            Tuple containing the health status and any error message
+        """
+        cache_key = (integration_id, from_date, limit, context_logs_count)
+        if (cached_health := self._logs_health_cache.get(cache_key)) is not None:
+            return cached_health
+
+        logs = await self._get_integration_logs(integration_id, limit)
+        health = self._determine_integration_health_from_logs(
+            logs, from_date, context_logs_count
+        )
+        self._logs_health_cache[cache_key] = health
+        return health
+
+    async def _get_integration_audit_logs_health(
+        self, integration_id: str, from_date: str
+    ) -> tuple[IntegrationHealth, str, int, int]:
+        """
+        Get the health and upsert statistics of an integration based on its audit logs,
+        reusing a recently cached result.
+
+        Args:
+            integration_id: The ID of the integration to check
+            from_date: The date to fetch audit logs from
+
+        Returns:
+            Tuple containing the health status, any error message, and the number of
+            successful and failed upserts
+        """
+        cache_key = (integration_id, from_date)
+        if (cached_health := self._audit_logs_health_cache.get(cache_key)) is not None:
+            return cached_health
+
+        audit_logs = await self._get_integration_audit_logs(integration_id, from_date)
+        health = (
+            *self._determine_integration_health_from_audit_logs(audit_logs),
+            *self._calculate_upsert_stats(audit_logs),
+        )
+        self._audit_logs_health_cache[cache_key] = health
+        return health
+
     def _determine_integration_health_from_logs(
-        self, logs: list[dict[str, Any]], from_date: str, context_logs_count: int = 3
+        self, logs: list[IntegrationLog], from_date: str, context_logs_count: int = 3
     ) -> tuple[IntegrationHealth, str]:
         """
         Determine the health status of an integration based on its logs.
-        
+
         Args:
-            logs: List of log entries to analyze
+            logs: List of (level, message, timestamp) log entries to analyze
             from_date: The date to consider logs from
             context_logs_count: Number of recent logs to include in error/warning messages (default: 3)
-            
+
         Returns:
             Tuple containing the health status and any error message. If there's an error or warning,
             the message will include the last N relevant logs for context, where N is context_logs_count.
         """
         if not logs:
             return "INACTIVE", ""
-            
-        # Keep track of the last few logs for context
-        recent_logs = []
+
+        # Keep track of the last few logs for context, only formatting them when needed
+        recent_logs: deque[IntegrationLog] = deque(maxlen=max(context_logs_count, 0))
         for log in reversed(logs):
-            recent_logs.append(f"[{log['timestamp']}] {log['level']}: {log['message']}")
-            if len(recent_logs) > context_logs_count:  # Keep only the last N logs
-                recent_logs.pop(0)
-                
-            if log["level"] == "ERROR":
-                context = "\nRecent logs:\n" + "\n".join(recent_logs)
-                return "ERROR", f"{log['message']}{context}"
-            if log["level"] == "WARNING":
-                context = "\nRecent logs:\n" + "\n".join(recent_logs)
-                return "WARNING", f"{log['message']}{context}"
-            if log["timestamp"] < from_date:
+            level, message, timestamp = log
+            recent_logs.append(log)
+
+            if level == "ERROR" or level == "WARNING":
+                context = "\nRecent logs:\n" + "\n".join(
+                    f"[{recent_timestamp}] {recent_level}: {recent_message}"
+                    for recent_level, recent_message, recent_timestamp in recent_logs
+                )
+                return cast(IntegrationHealth, level), f"{message}{context}"
+            if timestamp < from_date:
                 return "HEALTHY", ""
         return "HEALTHY", ""
 
@@ -198,10 +472,10 @@ class IntegrationClient:
     ) -> tuple[IntegrationHealth, str]:
         """
         Determine the health status of an integration based on its audit logs.
-        
+
         Args:
             logs: List of audit log entries to analyze
-            
+
         Returns:
             Tuple containing the health status and any error message
         """
@@ -212,114 +486,204 @@ class IntegrationClient:
                 return "ERROR", log["message"]
         return "HEALTHY", ""
 
-    def _calculate_upsert_stats(self, audit_logs: list[dict[str, Any]]) -> tuple[int, int]:
+    def _calculate_upsert_stats(
+        self, audit_logs: list[dict[str, Any]]
+    ) -> tuple[int, int]:
         """
         Calculate the number of successful and failed upserts from audit logs.
-        
+
         Args:
             audit_logs: List of audit log entries to analyze
-            
+
         Returns:
             Tuple containing (successful_upserts, failed_upserts)
         """
         successful_upserts = 0
         failed_upserts = 0
-        
+
         for log in audit_logs:
             if "upsert" in log.get("message", "").lower():
                 if log["status"] == "SUCCESS":
                     successful_upserts += 1
                 elif log["status"] == "FAILURE":
                     failed_upserts += 1
-                    
+
         return successful_upserts, failed_upserts
 
+    @staticmethod
+    def _is_initializing(integration: dict[str, Any]) -> bool:
+        """
+        Check whether an integration was just created and hasn't started a resync yet.
+
+        Args:
+            integration: The integration dictionary to check
+
+        Returns:
+            True if the integration has no resync start and was created within the grace period
+        """
+        if integration["resyncState"].get("lastResyncStart"):
+            return False
+        try:
+            created_at = datetime.fromisoformat(integration["createdAt"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - created_at < INITIALIZATION_GRACE_PERIOD
+
+    @staticmethod
+    def _discard_task(task: asyncio.Task[Any]) -> None:
+        """
+        Cancel a task whose result is no longer needed.
+
+        An exception raised while the task is being cancelled is retrieved so it isn't
+        reported as unhandled.
+
+        Args:
+            task: The task to cancel
+        """
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
     async def _enrich_integration_health(
         self, integration: dict[str, Any], log_limit: int, context_logs_count: int = 3
     ) -> dict[str, Any]:
         """
         Enrich an integration object with health status information.
-        
+
         This method checks both audit logs and regular logs to determine the integration's health.
         The health status is added as '__health' and any error message as '__errorMessage' to the integration dict.
-        
+
         Args:
             integration: The integration dictionary to enrich
             log_limit: Maximum number of logs to fetch
             context_logs_count: Number of recent logs to include in error/warning messages (default: 3)
-            
+
         Returns:
             The enriched integration dictionary
         """
-        logger.info(
-            f"Enriching integration health for integration: {integration['_id']}"
+        logger.debug(
+            "Enriching integration health for integration: {}", integration["_id"]
         )
-        if "resyncState" not in integration:
+        if "resyncState" not in integration or self._is_initializing(integration):
             integration["__health"] = "INACTIVE"
             integration["__errorMessage"] = ""
             integration["__successfulUpserts"] = 0
             integration["__failedUpserts"] = 0
             return integration
 
+        from_date = (
+            integration["resyncState"].get("lastResyncStart")
+            or integration["createdAt"]
+        )
+
+        # Fetch audit logs and regular logs concurrently. The regular logs are only
+        # needed if the audit logs show the integration as healthy, which is the common case
+        audit_logs_task = asyncio.create_task(
+            self._get_integration_audit_logs_health(
+                integration["installationId"], from_date
+            )
+        )
+        logs_task = asyncio.create_task(
+            self._get_integration_logs_health(
+                integration["installationId"],
+                from_date,
+                log_limit,
+                context_logs_count,
+            )
+        )
+
         # First check audit logs for failures
-        logs = await self._get_integration_audit_logs(
-            integration["installationId"],
+        try:
             (
-                integration["resyncState"].get("lastResyncStart")
-                or integration["createdAt"]
-            ),
-        )
-        
-        # Calculate upsert statistics from audit logs
-        successful_upserts, failed_upserts = self._calculate_upsert_stats(logs)
+                health,
+                error_message,
+                successful_upserts,
+                failed_upserts,
+            ) = await audit_logs_task
+        except BaseException:
+            self._discard_task(logs_task)
+            raise
+
         integration["__successfulUpserts"] = successful_upserts
         integration["__failedUpserts"] = failed_upserts
-        
-        health, error_message = self._determine_integration_health_from_audit_logs(
-            logs,
-        )
         if health != "HEALTHY":
+            self._discard_task(logs_task)
             integration["__health"] = health
             integration["__errorMessage"] = error_message
             return integration
 
         # If audit logs show healthy, check regular logs for warnings or errors
-        logs = await self._get_integration_logs(
-            integration["installationId"], log_limit
-        )
-        health, error_message = self._determine_integration_health_from_logs(
-            logs,
-            integration["resyncState"].get("lastResyncStart")
-            or integration["createdAt"],
-            context_logs_count,
-        )
+        health, error_message = await logs_task
         integration["__health"] = health
         integration["__errorMessage"] = error_message
         return integration
 
-    async def get_integrations(self, log_limit: int, context_logs_count: int = 3) -> list[dict[str, Any]]:
+    async def get_integrations(
+        self, log_limit: int, context_logs_count: int = 3, batch_size: int = 50
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
         """
         Get all integrations with their health status.
-        
+
+        Integrations are yielded in batches as soon as they are enriched, instead of
+        waiting for every integration to be enriched first. An integration whose health
+        can't be determined is yielded with an ERROR health describing the failure.
+
         Args:
             log_limit: Maximum number of logs to fetch for each integration
             context_logs_count: Number of recent logs to include in error/warning messages (default: 3)
-            
-        Returns:
-            List of integration dictionaries enriched with health information
+            batch_size: Maximum number of integrations in each yielded batch (default: 50)
+
+        Yields:
+            Batches of integration dictionaries enriched with health information
         """
         integrations = await self._fetch_integrations()
+
+        async def _bounded_enrich(integration: dict[str, Any]) -> dict[str, Any]:
+            async with self._semaphore:
+                try:
+                    return await self._enrich_integration_health(
+                        integration, log_limit, context_logs_count
+                    )
+                except Exception as e:
+                    # Report the failure as the integration's health, so one failing
+                    # integration doesn't fail the whole resync
+                    logger.exception(
+                        "Failed to determine health for integration {}",
+                        integration["_id"],
+                    )
+                    integration["__health"] = "ERROR"
+                    integration["__errorMessage"] = (
+                        f"Failed to determine integration health: {e}"
+                    )
+                    integration["__successfulUpserts"] = 0
+                    integration["__failedUpserts"] = 0
+                    return integration
+
+        # Logs are fetched per integration: the audit-log endpoint filters on a single
+        # InstallationId and the logs endpoint is scoped to one integration, so there is
+        # no bulk query to coalesce these requests into
         tasks = [
-            self._enrich_integration_health(integration, log_limit, context_logs_count)
+            asyncio.create_task(_bounded_enrich(integration))
             for integration in integrations
         ]
-        integrations = await asyncio.gather(*tasks)
-        return integrations
+        try:
+            batch: list[dict[str, Any]] = []
+            for next_integration in asyncio.as_completed(tasks):
+                batch.append(await next_integration)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def healthcheck(self) -> bool:
         """
         Perform a health check of the connection to Port's API.
-        
+
         Returns:
             True if the connection is healthy, False otherwise
         """
@@ -1,36 +1,46 @@
-from typing import Any, cast
+from typing import cast
 
 from loguru import logger
 from port_ocean.context.event import event
 from port_ocean.context.ocean import ocean
+from port_ocean.core.ocean_types import ASYNC_GENERATOR_RESYNC_TYPE
+from port_ocean.utils.signal import signal_handler
 
-from client import IntegrationClient
+from client import IntegrationClient, close_http_client
 from integration import IntegrationResourceConfig, ObjectKind
 
 
+_client: IntegrationClient | None = None
+
+
 def initialize_client() -> IntegrationClient:
-    return IntegrationClient(
-        ocean.config.port.client_id,
-        ocean.config.port.client_secret,
-        ocean.port_client.auth,
-        ocean.config.port.base_url,
-    )
+    # The client is shared between resyncs so it can reuse state from previous ones
+    global _client
+    if _client is None:
+        _client = IntegrationClient(
+            ocean.config.port.client_id,
+            ocean.config.port.client_secret,
+            ocean.port_client.auth,
+            ocean.config.port.base_url,
+        )
+    return _client
 
 
 @ocean.on_resync(ObjectKind.INTEGRATION)
-async def on_resync(kind: str) -> list[dict[Any, Any]]:
+async def on_resync(kind: str) -> ASYNC_GENERATOR_RESYNC_TYPE:
     selector = cast(IntegrationResourceConfig, event.resource_config).selector
     selector.validate_log_limit(selector.log_limit)
     logger.info(f"Resyncing integrations with log limit: {selector.log_limit} and context logs count: {selector.context_logs_count}")
     client = initialize_client()
-    integrations = await client.get_integrations(log_limit=selector.log_limit, context_logs_count=selector.context_logs_count)
-    logger.info(f"Received batch of {len(integrations)} integrations")
-    return integrations
+    async for integrations in client.get_integrations(log_limit=selector.log_limit, context_logs_count=selector.context_logs_count):
+        logger.info(f"Received batch of {len(integrations)} integrations")
+        yield integrations
 
 
 @ocean.on_start()
 async def on_start() -> None:
     logger.info("Starting Port integration")
+    signal_handler.register(close_http_client)
     client = initialize_client()
 
     status = await client.healthcheck()
@@ -0,0 +1,541 @@
+import asyncio
+import base64
+import gc
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+import client
+from client import IntegrationClient
+
+BASE_URL = "https://api.port.io"
+INTEGRATIONS_URL = f"{BASE_URL}/v1/integration"
+
+
+class FakePortAuthentication:
+    @property
+    async def token(self) -> str:
+        return "Bearer token"
+
+
+@pytest.fixture
+async def integration_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[IntegrationClient]:
+    http_client = client._create_http_client(timeout=5)
+    monkeypatch.setattr(client, "_http_client", http_client)
+    yield IntegrationClient(
+        "client-id",
+        "client-secret",
+        FakePortAuthentication(),  # type: ignore[arg-type]
+        BASE_URL,
+    )
+    await http_client.aclose()
+
+
+def _jwt(claims: dict[str, Any]) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode()
+    return f"Bearer header.{payload.rstrip('=')}.signature"
+
+
+def _integration(integration_id: str, **fields: Any) -> dict[str, Any]:
+    return {"_id": integration_id, "installationId": integration_id, **fields}
+
+
+async def test_fetch_integrations_is_conditional_once_cached(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(
+        url=INTEGRATIONS_URL,
+        json={"integrations": [_integration("first")]},
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(url=INTEGRATIONS_URL, status_code=304)
+
+    first = await integration_client._fetch_integrations()
+    second = await integration_client._fetch_integrations()
+
+    first_request, second_request = httpx_mock.get_requests()
+    assert "If-None-Match" not in first_request.headers
+    assert second_request.headers["If-None-Match"] == '"v1"'
+    assert first == second == [_integration("first")]
+
+
+async def test_fetch_integrations_returns_copies_of_cached_integrations(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(
+        url=INTEGRATIONS_URL,
+        json={"integrations": [_integration("first")]},
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(url=INTEGRATIONS_URL, status_code=304)
+
+    first = await integration_client._fetch_integrations()
+    first[0]["__health"] = "ERROR"
+    second = await integration_client._fetch_integrations()
+
+    assert second == [_integration("first")]
+    assert second[0] is not first[0]
+
+
+async def test_fetch_integrations_without_etag_is_unconditional(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(
+        url=INTEGRATIONS_URL, json={"integrations": [_integration("first")]}
+    )
+    httpx_mock.add_response(
+        url=INTEGRATIONS_URL, json={"integrations": [_integration("second")]}
+    )
+
+    await integration_client._fetch_integrations()
+    integrations = await integration_client._fetch_integrations()
+
+    assert all("If-None-Match" not in r.headers for r in httpx_mock.get_requests())
+    assert integrations == [_integration("second")]
+
+
+def test_token_ttl_expires_before_jwt_expiry() -> None:
+    ttl = IntegrationClient._get_token_ttl(_jwt({"exp": time.time() + 3600}))
+
+    expected = 3600 - client.TOKEN_EXPIRY_MARGIN_SECONDS
+    assert expected - 5 < ttl <= expected
+
+
+@pytest.mark.parametrize(
+    "token",
+    ["Bearer not-a-jwt", "Bearer header.!!!.signature", _jwt({"sub": "no-exp"})],
+)
+def test_token_ttl_falls_back_to_default(token: str) -> None:
+    assert IntegrationClient._get_token_ttl(token) == client.DEFAULT_TOKEN_TTL_SECONDS
+
+
+async def test_headers_are_cached_until_token_expiry(
+    integration_client: IntegrationClient,
+) -> None:
+    first = await integration_client._get_headers()
+    integration_client.auth = None  # type: ignore[assignment]
+
+    assert await integration_client._get_headers() is first
+
+
+def _created_ago(seconds: int) -> str:
+    created_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    return created_at.isoformat().replace("+00:00", "Z")
+
+
+@pytest.mark.parametrize(
+    "integration, expected",
+    [
+        (_integration("new", resyncState={}, createdAt=_created_ago(10)), True),
+        (_integration("old", resyncState={}, createdAt=_created_ago(3600)), False),
+        (
+            _integration(
+                "resynced",
+                resyncState={"lastResyncStart": "2025-01-01T00:00:00.000Z"},
+                createdAt=_created_ago(10),
+            ),
+            False,
+        ),
+        (_integration("invalid", resyncState={}, createdAt="not-a-date"), False),
+        (_integration("missing", resyncState={}), False),
+    ],
+)
+def test_is_initializing(integration: dict[str, Any], expected: bool) -> None:
+    assert IntegrationClient._is_initializing(integration) is expected
+
+
+async def test_initializing_integration_skips_log_fetches(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    integration = _integration("new", resyncState={}, createdAt=_created_ago(10))
+
+    enriched = await integration_client._enrich_integration_health(integration, 10)
+
+    assert enriched["__health"] == "INACTIVE"
+    assert httpx_mock.get_requests() == []
+
+
+def _audit_log_url(integration_id: str) -> re.Pattern[str]:
+    return re.compile(rf"{BASE_URL}/v1/audit-log\?.*InstallationId={integration_id}")
+
+
+def _logs_url(integration_id: str) -> re.Pattern[str]:
+    return re.compile(rf"{BASE_URL}/v1/integration/{integration_id}/logs\?.*")
+
+
+async def test_get_integrations_reports_failed_enrichment_as_error(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    resync_state = {"lastResyncStart": "2025-01-01T00:00:00.000Z"}
+    httpx_mock.add_response(
+        url=INTEGRATIONS_URL,
+        json={
+            "integrations": [
+                _integration("healthy", resyncState=resync_state),
+                _integration("failing", resyncState=resync_state),
+            ]
+        },
+    )
+    httpx_mock.add_response(
+        url=_audit_log_url("healthy"),
+        json={"audits": [{"status": "SUCCESS", "message": "Upsert entity"}]},
+    )
+    httpx_mock.add_response(
+        url=_logs_url("healthy"),
+        json={
+            "data": [
+                {
+                    "level": "INFO",
+                    "message": "Resync started",
+                    "timestamp": "2025-01-01T00:00:01.000Z",
+                }
+            ]
+        },
+    )
+    httpx_mock.add_response(url=_audit_log_url("failing"), status_code=400)
+    httpx_mock.add_response(
+        url=_logs_url("failing"), json={"data": []}, is_optional=True
+    )
+
+    batches = [batch async for batch in integration_client.get_integrations(10)]
+
+    integrations = {i["_id"]: i for batch in batches for i in batch}
+    assert integrations["healthy"]["__health"] == "HEALTHY"
+    assert integrations["healthy"]["__successfulUpserts"] == 1
+    failing = integrations["failing"]
+    assert failing["__health"] == "ERROR"
+    assert "400 Bad Request" in failing["__errorMessage"]
+    assert failing["__successfulUpserts"] == failing["__failedUpserts"] == 0
+
+
+async def test_get_integrations_yields_batches(
+    integration_client: IntegrationClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def fetch_integrations() -> list[dict[str, Any]]:
+        return [_integration(str(n)) for n in range(5)]
+
+    async def enrich(integration: dict[str, Any], *args: Any) -> dict[str, Any]:
+        return integration
+
+    monkeypatch.setattr(integration_client, "_fetch_integrations", fetch_integrations)
+    monkeypatch.setattr(integration_client, "_enrich_integration_health", enrich)
+
+    batches = [
+        batch async for batch in integration_client.get_integrations(10, batch_size=2)
+    ]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+async def test_get_integrations_cancels_pending_enrichments_on_close(
+    integration_client: IntegrationClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cancelled: list[str] = []
+
+    async def fetch_integrations() -> list[dict[str, Any]]:
+        return [_integration(str(n)) for n in range(3)]
+
+    async def enrich(integration: dict[str, Any], *args: Any) -> dict[str, Any]:
+        if integration["_id"] != "0":
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(integration["_id"])
+                raise
+        return integration
+
+    monkeypatch.setattr(integration_client, "_fetch_integrations", fetch_integrations)
+    monkeypatch.setattr(integration_client, "_enrich_integration_health", enrich)
+
+    integrations = integration_client.get_integrations(10, batch_size=1)
+    assert [i["_id"] for i in await integrations.__anext__()] == ["0"]
+    await integrations.aclose()
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == ["1", "2"]
+
+
+async def test_get_integrations_limits_concurrent_enrichments(
+    integration_client: IntegrationClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    concurrency = 2
+    bounded_client = IntegrationClient(
+        "client-id",
+        "client-secret",
+        FakePortAuthentication(),  # type: ignore[arg-type]
+        BASE_URL,
+        concurrency=concurrency,
+    )
+    running = 0
+    max_running = 0
+
+    async def fetch_integrations() -> list[dict[str, Any]]:
+        return [_integration(str(n)) for n in range(6)]
+
+    async def enrich(integration: dict[str, Any], *args: Any) -> dict[str, Any]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return integration
+
+    monkeypatch.setattr(bounded_client, "_fetch_integrations", fetch_integrations)
+    monkeypatch.setattr(bounded_client, "_enrich_integration_health", enrich)
+
+    batches = [batch async for batch in bounded_client.get_integrations(10)]
+
+    assert sum(len(batch) for batch in batches) == 6
+    assert max_running == concurrency
+
+
+def test_default_concurrency_fits_connection_pool() -> None:
+    # Each enrichment sends two requests at once
+    assert 2 * client.DEFAULT_CONCURRENCY <= client.HTTP_CLIENT_MAX_CONNECTIONS
+
+
+RESYNC_STATE = {"lastResyncStart": "2025-01-01T00:00:00.000Z"}
+
+
+async def test_enrichment_cancels_logs_request_when_audit_logs_fail(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    logs_cancelled = asyncio.Event()
+
+    async def pending_logs(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            logs_cancelled.set()
+            raise
+        return httpx.Response(200, json={"data": []})
+
+    httpx_mock.add_response(
+        url=_audit_log_url("failing"),
+        json={"audits": [{"status": "FAILURE", "message": "Failed to upsert"}]},
+    )
+    httpx_mock.add_callback(pending_logs, url=_logs_url("failing"))
+
+    enriched = await integration_client._enrich_integration_health(
+        _integration("failing", resyncState=RESYNC_STATE), 10
+    )
+
+    assert enriched["__health"] == "ERROR"
+    assert enriched["__errorMessage"] == "Failed to upsert"
+    await asyncio.wait_for(logs_cancelled.wait(), timeout=1)
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+async def test_enrichment_discards_failed_logs_task_when_audit_request_fails(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    unhandled_errors: list[dict[str, Any]] = []
+    asyncio.get_running_loop().set_exception_handler(
+        lambda loop, context: unhandled_errors.append(context)
+    )
+
+    logs_attempts = 0
+    logs_exhausted = asyncio.Event()
+
+    async def logs_error(request: httpx.Request) -> httpx.Response:
+        nonlocal logs_attempts
+        logs_attempts += 1
+        if logs_attempts == client.HTTP_CLIENT_RETRY_CONFIG["max_attempts"] + 1:
+            logs_exhausted.set()
+        return httpx.Response(500)
+
+    async def audit_error_after_logs(request: httpx.Request) -> httpx.Response:
+        # Fail only once the logs request has run out of retries and failed
+        await logs_exhausted.wait()
+        await asyncio.sleep(0.01)
+        return httpx.Response(500)
+
+    httpx_mock.add_callback(
+        audit_error_after_logs, url=_audit_log_url("failing"), is_reusable=True
+    )
+    httpx_mock.add_callback(logs_error, url=_logs_url("failing"), is_reusable=True)
+
+    async def enrich() -> str:
+        # Only keep the error's name, so its traceback doesn't keep the logs task alive
+        try:
+            await integration_client._enrich_integration_health(
+                _integration("failing", resyncState=RESYNC_STATE), 10
+            )
+        except httpx.HTTPError as e:
+            return type(e).__name__
+        return ""
+
+    assert await enrich() == "HTTPStatusError"
+    await asyncio.sleep(0)
+    gc.collect()
+
+    assert unhandled_errors == []
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+async def test_discard_task_retrieves_error_raised_during_cancellation() -> None:
+    unhandled_errors: list[dict[str, Any]] = []
+    asyncio.get_running_loop().set_exception_handler(
+        lambda loop, context: unhandled_errors.append(context)
+    )
+
+    async def fails_on_cancel() -> None:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            raise RuntimeError("cleanup failed")
+
+    task = asyncio.create_task(fails_on_cancel())
+    await asyncio.sleep(0)
+    IntegrationClient._discard_task(task)
+    await asyncio.sleep(0)
+    assert task.done()
+
+    del task
+    gc.collect()
+
+    assert unhandled_errors == []
+
+
+async def test_enrichment_uses_logs_when_audit_logs_are_healthy(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(
+        url=_audit_log_url("warning"),
+        json={"audits": [{"status": "SUCCESS", "message": "Upsert entity"}]},
+    )
+    httpx_mock.add_response(
+        url=_logs_url("warning"),
+        json={
+            "data": [
+                {
+                    "level": "WARNING",
+                    "message": "Rate limited",
+                    "timestamp": "2025-01-01T00:00:01.000Z",
+                }
+            ]
+        },
+    )
+
+    enriched = await integration_client._enrich_integration_health(
+        _integration("warning", resyncState=RESYNC_STATE), 10, context_logs_count=1
+    )
+
+    assert enriched["__health"] == "WARNING"
+    assert enriched["__errorMessage"] == (
+        "Rate limited\nRecent logs:\n"
+        "[2025-01-01T00:00:01.000Z] WARNING: Rate limited"
+    )
+    assert enriched["__successfulUpserts"] == 1
+
+
+def _add_healthy_responses(httpx_mock: HTTPXMock, integration_id: str) -> None:
+    httpx_mock.add_response(
+        url=_audit_log_url(integration_id),
+        json={"audits": [{"status": "SUCCESS", "message": "Upsert entity"}]},
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        url=_logs_url(integration_id), json={"data": []}, is_reusable=True
+    )
+
+
+async def test_enrichment_reuses_cached_health(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    _add_healthy_responses(httpx_mock, "cached")
+
+    first = await integration_client._enrich_integration_health(
+        _integration("cached", resyncState=RESYNC_STATE), 10
+    )
+    second = await integration_client._enrich_integration_health(
+        _integration("cached", resyncState=RESYNC_STATE), 10
+    )
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert second == first
+
+
+async def test_enrichment_refetches_logs_for_new_resync(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    _add_healthy_responses(httpx_mock, "resynced")
+
+    await integration_client._enrich_integration_health(
+        _integration("resynced", resyncState=RESYNC_STATE), 10
+    )
+    await integration_client._enrich_integration_health(
+        _integration(
+            "resynced",
+            resyncState={"lastResyncStart": "2025-01-02T00:00:00.000Z"},
+        ),
+        10,
+    )
+
+    audit_requests = httpx_mock.get_requests(url=_audit_log_url("resynced"))
+    assert [request.url.params["from"] for request in audit_requests] == [
+        "2025-01-01T00:00:00.000Z",
+        "2025-01-02T00:00:00.000Z",
+    ]
+    assert len(httpx_mock.get_requests(url=_logs_url("resynced"))) == 2
+
+
+async def test_enrichment_refetches_logs_for_different_limit(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    _add_healthy_responses(httpx_mock, "limited")
+
+    await integration_client._enrich_integration_health(
+        _integration("limited", resyncState=RESYNC_STATE), 10
+    )
+    await integration_client._enrich_integration_health(
+        _integration("limited", resyncState=RESYNC_STATE), 20
+    )
+
+    logs_requests = httpx_mock.get_requests(url=_logs_url("limited"))
+    assert [request.url.params["limit"] for request in logs_requests] == ["10", "20"]
+
+
+async def test_request_is_retried_after_server_error(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(url=INTEGRATIONS_URL, status_code=503)
+    httpx_mock.add_response(url=INTEGRATIONS_URL, json={"integrations": []})
+
+    response: dict[str, Any] = await integration_client._send_request(
+        "GET", INTEGRATIONS_URL
+    )
+
+    assert response == {"integrations": []}
+    assert len(httpx_mock.get_requests()) == 2
+
+
+async def test_client_error_is_not_retried(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(url=INTEGRATIONS_URL, status_code=400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await integration_client._send_request("GET", INTEGRATIONS_URL)
+
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_retries_stop_after_max_attempts(
+    integration_client: IntegrationClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(url=INTEGRATIONS_URL, status_code=500, is_reusable=True)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await integration_client._send_request("GET", INTEGRATIONS_URL)
+
+    # The first attempt is followed by max_attempts retries
+    assert len(httpx_mock.get_requests()) == 4